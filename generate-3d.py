@@ -144,10 +144,11 @@ def extract_script_code(output_text: str) -> str:
     in_code_block = False
 
     for line in lines:
-        if line.strip().startswith('```python') or line.strip().startswith('```'):
+        stripped = line.strip()
+        if stripped.startswith('```'):
             in_code_block = not in_code_block
             continue
-        elif in_code_block or (not any(line.strip().startswith(x) for x in ['```', '#'])):
+        elif in_code_block or not stripped.startswith(('```', '#')):
             code_lines.append(line)
 
     return '\n'.join(code_lines)
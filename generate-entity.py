@@ -4,40 +4,148 @@ Entity Generator Script
 
 Generates entities from scratch using Ollama:
 - First generates 2000 unique object names (max 5 duplicates each) saved to txt file
-- Then generates descriptions for each object in batches of 4
+- Then generates descriptions for each object in batches of 8
 - Each entity has a creative 3-7 word object name and description under 50 words
 
 Outputs a JSON array where each item has:
   { "object": string, "description": string }
 
+Entities are also appended to a JSON Lines checkpoint next to the output
+file (entities.jsonl for entities.json) as soon as they are described.
+If Ollama stops answering, placeholder descriptions are used and marked
+"templated": true; later runs describe those objects again.
+
 Usage:
-  ./generate-entity2.py [count] [names_file] [output_file]
+  ./generate-entity2.py [count] [names_file] [output_file] [processes]
 
 Defaults:
   count = 2000
   names_file = objects_generated.txt
   output_file = entities.json
+  processes = 1 (worker processes for the description pass)
 """
 
+import io
 import json
+import multiprocessing
+import os
+import re
 import sys
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, BinaryIO
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from llm_cache import LLMCache
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _json_dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:  # orjson is optional; the stdlib codec is fine, just slower
+    _json_loads = json.loads
+
+    def _json_dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def _json_dumps_line(obj: Any) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+# Markdown characters dropped from answers, and the characters trimmed off
+# both ends of every answer
+_MD_STRIP = str.maketrans("", "", "*_`#")
+_EDGE_STRIP = "\"'  \n\r\t"
+
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+# Lines mentioning any of these are prompt echoes, not object names
+_SKIP_WORDS = frozenset({"json", "array", "generate", "format", "example"})
+_SKIP_RE = re.compile("|".join(sorted(_SKIP_WORDS)), re.IGNORECASE)
+# A bare object-name line: 3-7 words of letters, apostrophes and hyphens,
+# each word holding at least one letter
+_NAME_WORD = r"(?!['-]+(?:\s|$))(?:[^\W\d_]|['-])+"
+_NAME_LINE_RE = re.compile(rf"{_NAME_WORD}(?:\s+{_NAME_WORD}){{2,6}}")
+
+# A numbered answer line in a batched reply, e.g. "3. A wooden chair..."
+_NUMBERED_RE = re.compile(r"^\s*(\d+)[.)]\s+(.+?)\s*$", re.MULTILINE)
+
+NAMES_SYSTEM = (
+    "You are a helpful assistant that generates JSON arrays of object names. "
+    "Output only valid JSON, no explanations, no markdown."
+)
+
+# Every description request shares this exact system text so Ollama can reuse
+# the evaluated prefix; only the object names at the tail of the prompt vary.
+DESCRIPTION_SYSTEM = (
+    "You write a detailed description under 50 words describing the parts and components of an object. "
+    "One sentence only, plain text, no lists. "
+    "When given a numbered list of objects, answer with one line per object, numbered to match, like '1. <description>'. "
+    "Example: 'A wooden chair with a slatted backrest, four tapered legs, cross-bracing for stability, and a smooth contoured seat with visible grain.'"
+)
 
 
 class EntityGenerator:
-    def __init__(self, ollama_url: str = "http://localhost:11434") -> None:
+    def __init__(
+        self,
+        ollama_url: str = "http://localhost:11434",
+        concurrency: int = 8,
+        batch_size: int = 8,
+        cache_path: Optional[Path] = Path("ollama_cache.db"),
+        processes: int = 1,
+    ) -> None:
         self.ollama_url = ollama_url
+        # Number of description requests kept in flight at once
+        self.concurrency = max(1, concurrency)
+        # Objects described per request; 1 falls back to one call per object
+        self.batch_size = max(1, batch_size)
+        # Worker processes for the description pass; each runs its own pool
+        self.processes = max(1, processes)
+        self.cache_path = cache_path
         # Use a more capable model for generation
         self.model = "llama3.2:3b"
         # No input file; generation is from scratch
 
+        # Reuse keep-alive connections across every Ollama call; the pool is
+        # sized so each concurrent worker gets its own connection.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10, pool_maxsize=max(10, self.concurrency), max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+
+        # Description prompts are fixed per object, so re-runs can reuse earlier
+        # answers instead of asking the model again. None disables the cache.
+        self.cache = LLMCache(cache_path) if cache_path else None
+
+        # Request bodies minus the prompt, built once per distinct call shape
+        self._payload_templates: Dict[tuple, Dict[str, Any]] = {}
+
+        # After this many failed description requests in a row Ollama is
+        # treated as down and the remaining objects get a template instead.
+        # Every desc_probe_interval-th templated object tries Ollama again.
+        self.max_desc_failures = 10
+        self.desc_probe_interval = 50
+        self._desc_consecutive_failures = 0
+        self._desc_degraded = False
+        self._desc_templated = 0
+        self._desc_lock = threading.Lock()
+
     def check_ollama_connection(self) -> bool:
         try:
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.ollama_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 model_names = [model["name"] for model in models]
@@ -52,56 +160,93 @@ class EntityGenerator:
             print(f"✗ Cannot connect to Ollama: {e}")
             return False
 
-    def call_ollama(self, prompt: str) -> Optional[str]:
-        try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "system": (
-                    "You are a helpful assistant that generates JSON arrays of object names. "
-                    "Output only valid JSON, no explanations, no markdown."
-                ),
-                "options": {
-                    "temperature": 1.0,
-                    "top_p": 0.95,
-                    "num_predict": 200,
+    def payload_template(self, system: str, num_predict: int, stream: bool) -> Dict[str, Any]:
+        key = (system, num_predict, stream)
+        template = self._payload_templates.get(key)
+        if template is None:
+            template = self._payload_templates.setdefault(
+                key,
+                {
+                    "model": self.model,
+                    "stream": stream,
+                    "system": system,
+                    # Keep the model (and its cached prompt prefix) loaded between calls
+                    "keep_alive": "30m",
+                    "options": {
+                        "temperature": 1.0,
+                        "top_p": 0.95,
+                        "num_predict": num_predict,
+                    },
                 },
-            }
-
-            response = requests.post(
-                f"{self.ollama_url}/api/generate", json=payload, timeout=30
             )
+        return template
+
+    def call_ollama(
+        self,
+        prompt: str,
+        num_predict: int = 200,
+        first_line_only: bool = True,
+        system: str = NAMES_SYSTEM,
+    ) -> Optional[str]:
+        try:
+            # Single-line answers are streamed so generation can stop at the
+            # first newline instead of producing tokens that get thrown away.
+            stream = first_line_only
+            payload = dict(self.payload_template(system, num_predict, stream), prompt=prompt)
+
+            with self.session.post(
+                f"{self.ollama_url}/api/generate", json=payload, timeout=30, stream=stream
+            ) as response:
+                if response.status_code != 200:
+                    print(f"✗ Ollama API error: {response.status_code} - {response.text}")
+                    return None
+                if stream:
+                    response_text = self.read_first_line(response).strip()
+                else:
+                    response_text = response.json().get("response", "").strip()
 
-            if response.status_code == 200:
-                result = response.json()
-                response_text = result.get("response", "").strip()
-
-                # Sanitize thinking tags and patterns like "x -> y"
-                if "<think>" in response_text and "</think>" in response_text:
-                    response_text = response_text.split("</think>")[-1].strip()
-                elif "<think>" in response_text:
-                    response_text = response_text.split("<think>")[0].strip()
-
-                if "->" in response_text:
-                    response_text = response_text.split("->")[-1].strip()
+            # Sanitize thinking tags and patterns like "x -> y"
+            if "<think>" in response_text and "</think>" in response_text:
+                response_text = response_text.split("</think>")[-1].strip()
+            elif "<think>" in response_text:
+                response_text = response_text.split("<think>")[0].strip()
 
-                response_text = response_text.strip('\"\'  \n\r\t')
-                response_text = (
-                    response_text.replace("*", "").replace("_", "").replace("`", "").replace("#", "")
-                )
+            if first_line_only and "->" in response_text:
+                response_text = response_text.split("->")[-1].strip()
 
-                if "\n" in response_text:
-                    response_text = response_text.split("\n")[0].strip()
+            response_text = response_text.strip(_EDGE_STRIP).translate(_MD_STRIP)
 
-                return response_text if response_text else None
+            # Multi-item answers (numbered batches) keep every line
+            if first_line_only and "\n" in response_text:
+                response_text = response_text.split("\n")[0].strip()
 
-            print(f"✗ Ollama API error: {response.status_code} - {response.text}")
-            return None
-        except requests.exceptions.RequestException as e:
+            return response_text if response_text else None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: a truncated or garbled JSON chunk in the response
             print(f"✗ Error calling Ollama: {e}")
             return None
 
+    @staticmethod
+    def read_first_line(response: requests.Response) -> str:
+        """Accumulate a streamed answer until its first complete line.
+
+        Text inside an unfinished <think> block never ends the read, and
+        leading blank lines are ignored, matching the non-streamed cleanup.
+        """
+        text = ""
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = _json_loads(line)
+            text += chunk.get("response", "")
+            if chunk.get("done"):
+                break
+            if "<think>" in text and "</think>" not in text:
+                continue
+            if "\n" in text.split("</think>")[-1].lstrip():
+                break
+        return text
+
     def create_names_prompt(self, count: int) -> str:
         return (
             "Generate a JSON array with exactly "
@@ -113,11 +258,12 @@ class EntityGenerator:
         )
 
     def create_single_description_prompt(self, object_name: str) -> str:
-        return (
-            f"Write a detailed description under 50 words describing the parts and components of a {object_name}. "
-            "One sentence only, plain text, no lists. "
-            "Example: 'A wooden chair with a slatted backrest, four tapered legs, cross-bracing for stability, and a smooth contoured seat with visible grain.'"
-        )
+        # Instructions live in DESCRIPTION_SYSTEM; only the object name varies
+        return f"Object: {object_name}\nDescription:"
+
+    def create_batch_description_prompt(self, object_names: List[str]) -> str:
+        numbered = "\n".join(f"{i}. {name}" for i, name in enumerate(object_names, 1))
+        return f"Objects:\n{numbered}\nDescriptions:"
 
     def validate_object_name(self, name: str) -> Optional[str]:
         if not name:
@@ -161,8 +307,9 @@ class EntityGenerator:
             # Clean up the text first
             text = text.strip()
             
-            # Try multiple extraction strategies
-            candidates = []
+            # Try multiple extraction strategies; raw JSON text is decoded
+            # below, the other strategies already produce lists
+            candidates: List[Any] = []
             
             # Strategy 1: Look for JSON array
             start = text.find("[")
@@ -171,40 +318,38 @@ class EntityGenerator:
                 candidates.append(text[start : end + 1])
             
             # Strategy 2: Look for quoted strings separated by commas
-            import re
-            quoted_strings = re.findall(r'"([^"]+)"', text)
+            quoted_strings = _QUOTED_RE.findall(text)
             if quoted_strings:
-                candidates.append(json.dumps(quoted_strings))
+                candidates.append(quoted_strings)
             
             # Strategy 3: Look for lines that look like object names
             lines = [line.strip() for line in text.split('\n') if line.strip()]
             object_like_lines = []
             for line in lines:
                 # Skip obvious non-object lines
-                if any(skip in line.lower() for skip in ['json', 'array', 'generate', 'format', 'example']):
+                if _SKIP_RE.search(line):
                     continue
                 # Look for lines that are 3-7 words
-                words = line.split()
-                if 3 <= len(words) <= 7 and all(word.replace('-', '').replace("'", '').isalpha() for word in words):
-                    object_like_lines.append(line.strip('"\'  \n\r\t'))
+                if _NAME_LINE_RE.fullmatch(line):
+                    object_like_lines.append(line.strip(_EDGE_STRIP))
             
             if object_like_lines:
-                candidates.append(json.dumps(object_like_lines))
+                candidates.append(object_like_lines)
             
             # Try each candidate
             for candidate in candidates:
                 try:
-                    data = json.loads(candidate)
+                    data = _json_loads(candidate) if isinstance(candidate, str) else candidate
                     if isinstance(data, list) and data:
                         names: List[str] = []
                         for item in data:
                             if isinstance(item, str):
-                                cleaned = (item or "").strip().strip('\"\'  \n\r\t')
+                                cleaned = (item or "").strip().strip(_EDGE_STRIP)
                                 if self.validate_object_name(cleaned):
                                     names.append(cleaned)
                         if names:
                             return names
-                except json.JSONDecodeError:
+                except ValueError:
                     continue
             
             return []
@@ -287,116 +432,292 @@ class EntityGenerator:
     def generate_object_names(self, target_count: int, per_request: int, names_file: Path) -> List[str]:
         # Check if we can resume from existing file
         existing_names: List[str] = []
-        frequency: Dict[str, int] = {}
+        frequency: Counter = Counter()
 
         if names_file.exists():
             existing_names = names_file.read_text(encoding="utf-8").strip().split("\n")
             existing_names = [n.strip() for n in existing_names if n.strip()]
-            for name in existing_names:
-                key = name.lower()
-                frequency[key] = frequency.get(key, 0) + 1
+            frequency.update(name.lower() for name in existing_names)
             if len(existing_names) >= target_count:
                 print(f"Found {len(existing_names)} existing names in {names_file}, using those.")
                 return existing_names[:target_count]
             print(f"Resuming from {len(existing_names)} existing names...")
         else:
             print(f"Generating up to {target_count} object names in batches of {per_request}...")
-            names_file.write_text("", encoding="utf-8")
 
         names: List[str] = existing_names
         attempts = 0
         max_attempts = target_count * 10
         consecutive_failures = 0
         start_time = time.time()
-
-        while len(names) < target_count and attempts < max_attempts:
-            attempts += 1
-            batch = self.request_names_batch(per_request)
-            if not batch:
-                consecutive_failures += 1
-                if consecutive_failures >= 10:
-                    print("Too many consecutive failures. Stopping generation.")
-                    break
-                continue
-            
-            consecutive_failures = 0
-            added_this_round = 0
-            for n in batch:
-                key = n.lower()
-                count = frequency.get(key, 0)
-                if count >= 5:
+        # Report once per 100 names crossed, however the batches land
+        next_report = (len(names) // 100 + 1) * 100
+
+        # One append handle for the whole run; flushed every 50 names so an
+        # interrupted run loses at most a few names on resume.
+        with names_file.open("a", encoding="utf-8", buffering=1 << 16) as fout:
+            while len(names) < target_count and attempts < max_attempts:
+                attempts += 1
+                batch = self.request_names_batch(per_request)
+                if not batch:
+                    consecutive_failures += 1
+                    if consecutive_failures >= 10:
+                        print("Too many consecutive failures. Stopping generation.")
+                        break
                     continue
-                names.append(n)
-                frequency[key] = count + 1
-                # Append to file immediately
-                with names_file.open("a", encoding="utf-8") as f:
-                    f.write(n + "\n")
-                added_this_round += 1
-                if len(names) >= target_count:
-                    break
-            if added_this_round == 0:
-                # Avoid infinite loop if model keeps repeating
-                time.sleep(0.2)
-            if len(names) % 100 == 0 and len(names) > 0:
-                elapsed = time.time() - start_time
-                rate = len(names) / elapsed
-                remaining = target_count - len(names)
-                eta_seconds = remaining / rate if rate > 0 else 0
-                eta_minutes = eta_seconds / 60
-                print(f"  ✓ Collected {len(names)}/{target_count} names | ETA: {eta_minutes:.1f} min")
+
+                consecutive_failures = 0
+                # Batches are already unique case-insensitively, so one
+                # filter pass against the counts accepts the same names as
+                # checking them one at a time.
+                lowered = [n.lower() for n in batch]
+                accepted = [(n, key) for n, key in zip(batch, lowered) if frequency[key] < 5]
+                accepted = accepted[: target_count - len(names)]
+                added_this_round = len(accepted)
+                before = len(names)
+                frequency.update(key for _, key in accepted)
+                names.extend(n for n, _ in accepted)
+                fout.writelines(n + "\n" for n, _ in accepted)
+                if len(names) // 50 > before // 50:
+                    fout.flush()
+                if added_this_round == 0:
+                    # Avoid infinite loop if model keeps repeating
+                    time.sleep(0.2)
+                if len(names) >= next_report:
+                    next_report = (len(names) // 100 + 1) * 100
+                    elapsed = time.time() - start_time
+                    rate = len(names) / elapsed
+                    remaining = target_count - len(names)
+                    eta_seconds = remaining / rate if rate > 0 else 0
+                    eta_minutes = eta_seconds / 60
+                    print(f"  ✓ Collected {len(names)}/{target_count} names | ETA: {eta_minutes:.1f} min")
 
         elapsed = time.time() - start_time
         print(f"Collected {len(names)} names in {elapsed:.1f}s (attempts: {attempts}).")
         return names[:target_count]
 
-    def generate_descriptions_for_names(self, object_names: List[str]) -> List[Dict[str, str]]:
+    def template_description(self, name: str) -> str:
+        return f"A {name} with identifiable components, a stable base, and a clean, simple overall form."
+
+    def is_template(self, name: str, desc: str) -> bool:
+        return desc == self.template_description(name)
+
+    def use_template(self) -> bool:
+        """While degraded, answer with a template except on periodic probes."""
+        with self._desc_lock:
+            if not self._desc_degraded:
+                return False
+            self._desc_templated += 1
+            return self._desc_templated % self.desc_probe_interval != 0
+
+    def record_description_result(self, ok: bool) -> None:
+        with self._desc_lock:
+            if ok:
+                self._desc_consecutive_failures = 0
+                if self._desc_degraded:
+                    self._desc_degraded = False
+                    print("Ollama is answering again. Resuming real descriptions.")
+                return
+            self._desc_consecutive_failures += 1
+            if (
+                self._desc_consecutive_failures >= self.max_desc_failures
+                and not self._desc_degraded
+            ):
+                self._desc_degraded = True
+                print(
+                    f"{self._desc_consecutive_failures} description requests failed in a row. "
+                    "Using template descriptions for the remaining objects."
+                )
+
+    def description_cache_key(self, name: str) -> str:
+        """Cache key for a name's description, shared by single and batch requests."""
+        prompt = self.create_single_description_prompt(name)
+        return LLMCache.make_key(dict(self.payload_template(DESCRIPTION_SYSTEM, 200, True), prompt=prompt))
+
+    def cached_description(self, name: str) -> Optional[str]:
+        """A valid cached description for name, if any.
+
+        Only validated descriptions are stored, but the check is repeated so
+        caches written by older versions cannot replay a bad answer.
+        """
+        if not self.cache:
+            return None
+        cached = self.cache.get(self.description_cache_key(name))
+        return self.validate_description(cached) if cached else None
+
+    def cache_description(self, name: str, desc: Optional[str]) -> None:
+        if desc and self.cache:
+            self.cache.set(self.description_cache_key(name), desc)
+
+    def describe_object(self, name: str, check_cache: bool = True) -> Optional[str]:
+        if self.use_template():
+            return self.template_description(name)
+
+        cached = self.cached_description(name) if check_cache else None
+        if cached:
+            return cached
+
+        prompt = self.create_single_description_prompt(name)
+        text = self.call_ollama(prompt, system=DESCRIPTION_SYSTEM)
+        if not text:
+            self.record_description_result(False)
+            return None
+
+        # Clean up the response
+        desc = text.strip().strip(_EDGE_STRIP)
+        # Remove any thinking tags
+        if "<think>" in desc and "</think>" in desc:
+            desc = desc.split("</think>")[-1].strip()
+        elif "<think>" in desc:
+            desc = desc.split("<think>")[0].strip()
+
+        # Validate and enforce word limit
+        valid_desc = self.validate_description(desc)
+        self.record_description_result(valid_desc is not None)
+        self.cache_description(name, valid_desc)
+        return valid_desc
+
+    def describe_batch(self, object_names: List[str]) -> Dict[str, Optional[str]]:
+        """Describe several objects with one request, retrying misses one by one."""
+        if len(object_names) == 1:
+            return {object_names[0]: self.describe_object(object_names[0])}
+        if self._desc_degraded:
+            # One by one, so the periodic probes can bring Ollama back
+            return {name: self.describe_object(name) for name in object_names}
+
+        # Names described on an earlier run come from the cache, one entry per
+        # name, so only the rest go into the batch request
+        results: Dict[str, Optional[str]] = {name: self.cached_description(name) for name in object_names}
+        missing = [name for name in object_names if not results[name]]
+        if len(missing) <= 1:
+            for name in missing:
+                results[name] = self.describe_object(name, check_cache=False)
+            return results
+
+        prompt = self.create_batch_description_prompt(missing)
+        text = self.call_ollama(
+            prompt,
+            num_predict=120 * len(missing),
+            first_line_only=False,
+            system=DESCRIPTION_SYSTEM,
+        )
+
+        if text:
+            for match in _NUMBERED_RE.finditer(text):
+                index = int(match.group(1)) - 1
+                if 0 <= index < len(missing) and not results[missing[index]]:
+                    desc = self.validate_description(match.group(2).strip(_EDGE_STRIP))
+                    results[missing[index]] = desc
+                    self.cache_description(missing[index], desc)
+        if any(results[name] for name in missing):
+            self.record_description_result(True)
+
+        # Anything the batch answer missed or got wrong gets its own request
+        for name in missing:
+            if not results[name]:
+                results[name] = self.describe_object(name, check_cache=False)
+        return results
+
+    def generate_descriptions_for_names(self, object_names: List[str], sink: BinaryIO) -> int:
+        """Describe each name, appending every entity to sink as a JSON line.
+
+        Returns the number of entities written.
+        """
+        # Names may repeat (up to 5 times); each is only described once
+        object_names = list(dict.fromkeys(object_names))
         if not object_names:
-            return []
+            return 0
 
-        print(f"Generating descriptions one by one for {len(object_names)} objects...")
-        results: List[Dict[str, str]] = []
+        print(
+            f"Generating descriptions for {len(object_names)} objects in batches of "
+            f"{self.batch_size} with {self.concurrency} concurrent requests..."
+        )
+        described = 0
+        completed = 0
         start_time = time.time()
 
-        for i, name in enumerate(object_names):
-            print(f"  [{i+1}/{len(object_names)}] Processing: {name}")
-            
-            prompt = self.create_single_description_prompt(name)
-            text = self.call_ollama(prompt)
-            
-            if text:
-                # Clean up the response
-                desc = text.strip().strip('\"\'  \n\r\t')
-                # Remove any thinking tags
-                if "<think>" in desc and "</think>" in desc:
-                    desc = desc.split("</think>")[-1].strip()
-                elif "<think>" in desc:
-                    desc = desc.split("<think>")[0].strip()
-
-                # Validate and enforce word limit
-                valid_desc = self.validate_description(desc)
-                if valid_desc:
-                    results.append({"object": name, "description": valid_desc})
-                    print(f"    → {valid_desc}")
-                else:
-                    print(f"    → (skipped - invalid description)")
-            else:
-                print(f"    → (skipped - no response)")
-            
-            # Progress update every 50 items
-            if (i + 1) % 50 == 0:
-                elapsed = time.time() - start_time
-                rate = (i + 1) / elapsed
-                remaining = len(object_names) - (i + 1)
-                eta_seconds = remaining / rate if rate > 0 else 0
-                eta_minutes = eta_seconds / 60
-                print(f"  ✓ Described {len(results)}/{len(object_names)} | ETA: {eta_minutes:.1f} min")
-
-            # Small delay to avoid overwhelming the model
-            time.sleep(0.1)
+        # Ollama serves concurrent requests, so keep several in flight instead
+        # of waiting on each round-trip in turn.
+        batches = [
+            object_names[i : i + self.batch_size]
+            for i in range(0, len(object_names), self.batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            future_to_batch = {executor.submit(self.describe_batch, batch): batch for batch in batches}
+            for future in as_completed(future_to_batch):
+                batch = future_to_batch[future]
+                try:
+                    batch_results = future.result()
+                except Exception as e:
+                    batch_results = {}
+                    print(f"  Batch of {len(batch)} failed: {e}")
+
+                for name in batch:
+                    completed += 1
+                    valid_desc = batch_results.get(name)
+                    if valid_desc:
+                        entity = {"object": name, "description": valid_desc}
+                        # Flagged so a later run describes the object for real
+                        if self.is_template(name, valid_desc):
+                            entity["templated"] = True
+                        sink.write(_json_dumps_line(entity))
+                        described += 1
+                        print(f"  [{completed}/{len(object_names)}] {name} → {valid_desc}")
+                    else:
+                        print(f"  [{completed}/{len(object_names)}] {name}: (skipped - no valid description)")
+
+                    # Progress update every 50 items
+                    if completed % 50 == 0:
+                        elapsed = time.time() - start_time
+                        rate = completed / elapsed
+                        remaining = len(object_names) - completed
+                        eta_seconds = remaining / rate if rate > 0 else 0
+                        eta_minutes = eta_seconds / 60
+                        print(f"  ✓ Described {described}/{len(object_names)} | ETA: {eta_minutes:.1f} min")
+
+                # Checkpoint after every batch so a crash loses at most one
+                sink.flush()
 
         elapsed = time.time() - start_time
-        print(f"Generated {len(results)} descriptions in {elapsed:.1f}s")
-        return results
+        print(f"Generated {described} descriptions in {elapsed:.1f}s")
+        if self.cache:
+            print(f"Response cache: {self.cache.stats['hits']} hits, {self.cache.stats['misses']} misses")
+        return described
+
+    def describe_in_processes(self, object_names: List[str], sink: BinaryIO) -> int:
+        """Spread the description pass over worker processes.
+
+        Names are split into small shards so finished work reaches the
+        checkpoint steadily; only this process writes to sink.
+        """
+        object_names = list(dict.fromkeys(object_names))
+        shard_size = self.batch_size * self.concurrency
+        shards = [object_names[i : i + shard_size] for i in range(0, len(object_names), shard_size)]
+        print(f"Describing {len(object_names)} objects in {len(shards)} shards across {self.processes} processes...")
+
+        described = 0
+        init_args = (self.ollama_url, self.concurrency, self.batch_size, self.cache_path)
+        with multiprocessing.Pool(self.processes, initializer=_init_worker, initargs=init_args) as pool:
+            for lines in pool.imap_unordered(_describe_shard, shards):
+                sink.write(lines)
+                sink.flush()
+                described += lines.count(b"\n")
+        return described
+
+    @staticmethod
+    def load_checkpoint(jsonl_file: Path) -> Dict[str, Dict[str, Any]]:
+        """Map each object name in the JSONL checkpoint to its entity."""
+        described: Dict[str, Dict[str, Any]] = {}
+        if jsonl_file.exists():
+            with jsonl_file.open("rb") as f:
+                for line in f:
+                    try:
+                        entity = _json_loads(line)
+                    except ValueError:
+                        # A run killed mid-write can leave a partial last line
+                        continue
+                    described[entity["object"]] = entity
+        return described
 
     def fallback_items_DISABLED(self, count: int) -> List[Dict[str, str]]:
         seeds = [
@@ -421,8 +742,10 @@ class EntityGenerator:
         existing_entities: List[Dict[str, Any]] = []
         if output_file.exists():
             try:
-                with open(output_file, "r", encoding="utf-8") as f:
-                    existing_entities = json.load(f)
+                # Templated entities from a degraded run are described again
+                existing_entities = [
+                    e for e in _json_loads(output_file.read_bytes()) if not e.get("templated")
+                ]
                 if len(existing_entities) >= count:
                     print(f"Found {len(existing_entities)} existing entities in {output_file}, skipping generation.")
                     return existing_entities[:count]
@@ -437,10 +760,31 @@ class EntityGenerator:
         processed_names = {e["object"] for e in existing_entities}
         remaining_names = [n for n in names if n not in processed_names]
 
+        # Entities go to a JSON Lines checkpoint as they complete; the final
+        # array is only assembled once the pass is over. Names already in the
+        # checkpoint from an interrupted run are not described again.
+        jsonl_file = output_file.with_suffix(".jsonl")
+        checkpoint = self.load_checkpoint(jsonl_file)
         if remaining_names:
-            print(f"Generating descriptions for {len(remaining_names)} remaining objects...")
-            new_entities = self.generate_descriptions_for_names(remaining_names)
-            entities = existing_entities + new_entities
+            todo_names = [
+                n for n in remaining_names if n not in checkpoint or checkpoint[n].get("templated")
+            ]
+            if len(todo_names) < len(remaining_names):
+                print(f"Resuming: {len(remaining_names) - len(todo_names)} descriptions already in {jsonl_file}")
+            if todo_names:
+                print(f"Generating descriptions for {len(todo_names)} remaining objects...")
+                with jsonl_file.open("a+b") as sink:
+                    # Terminate a partial last line so new entities start clean
+                    if sink.tell():
+                        sink.seek(-1, os.SEEK_END)
+                        if sink.read(1) != b"\n":
+                            sink.write(b"\n")
+                    if self.processes > 1:
+                        self.describe_in_processes(todo_names, sink)
+                    else:
+                        self.generate_descriptions_for_names(todo_names, sink)
+                checkpoint = self.load_checkpoint(jsonl_file)
+            entities = existing_entities + [checkpoint[n] for n in remaining_names if n in checkpoint]
         else:
             print("All names already have descriptions.")
             entities = existing_entities
@@ -449,6 +793,22 @@ class EntityGenerator:
         return entities
 
 
+_worker_generator: Optional[EntityGenerator] = None
+
+
+def _init_worker(ollama_url: str, concurrency: int, batch_size: int, cache_path: Optional[Path]) -> None:
+    global _worker_generator
+    _worker_generator = EntityGenerator(
+        ollama_url, concurrency=concurrency, batch_size=batch_size, cache_path=cache_path
+    )
+
+
+def _describe_shard(object_names: List[str]) -> bytes:
+    buffer = io.BytesIO()
+    _worker_generator.generate_descriptions_for_names(object_names, buffer)
+    return buffer.getvalue()
+
+
 def main() -> None:
     print("Entity Generator Script")
     print("=" * 30)
@@ -468,7 +828,14 @@ def main() -> None:
     if len(sys.argv) > 3:
         output_file = sys.argv[3]
 
-    generator = EntityGenerator()
+    processes = 1
+    if len(sys.argv) > 4:
+        try:
+            processes = int(sys.argv[4])
+        except ValueError:
+            print("Invalid processes. Using default: 1")
+
+    generator = EntityGenerator(processes=processes)
     if not generator.check_ollama_connection():
         print("Please ensure Ollama is running and the model is available.")
         return
@@ -476,8 +843,7 @@ def main() -> None:
     entities = generator.generate(count=count, names_file=Path(names_file), output_file=Path(output_file), per_request=10)
 
     out_path = Path(output_file)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(entities, f, ensure_ascii=False, indent=2)
+    out_path.write_bytes(_json_dumps_pretty(entities))
     print(f"✓ Saved to {out_path}")
 
 
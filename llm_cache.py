@@ -0,0 +1,45 @@
+"""
+SQLite response cache shared by generate-entity.py and v1/filter-object.py.
+
+Callers store only answers that passed their own validation, and validate
+again on read, so a bad reply is never replayed from the cache.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class LLMCache:
+    """Exact-match response cache for deterministic prompts, stored in SQLite."""
+
+    def __init__(self, db_path: Path) -> None:
+        # Worker processes may share the file, so wait on their write locks
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        # Everything that shapes the output: model, system, prompt and options
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            self.stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def set(self, key: str, response: str) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response)
+            )
+            self.conn.commit()
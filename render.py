@@ -17,14 +17,20 @@ import random
 import subprocess
 import sys
 import os
-import tempfile
 import argparse
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; the stdlib parser is just slower
+    _json_loads = json.loads
+
 def load_generated_scripts():
     """Load the generated scripts from JSON file."""
     try:
-        with open('generated_scripts.json', 'r') as f:
-            return json.load(f)
+        with open('generated_scripts.json', 'rb') as f:
+            return _json_loads(f.read())
     except FileNotFoundError:
         print("❌ Error: generated_scripts.json not found. Run generate-dataset.py first.")
         sys.exit(1)
@@ -33,75 +39,57 @@ def load_generated_scripts():
         sys.exit(1)
 
 def extract_script_code(output_text):
-    """Extract Python code from the output text (removes markdown formatting)."""
-    lines = output_text.split('\n')
-    code_lines = []
-    in_code_block = False
-
-    for line in lines:
-        if line.strip().startswith('```python'):
-            in_code_block = True
-            continue
-        elif line.strip() == '```' and in_code_block:
-            in_code_block = False
-            continue
-        elif in_code_block:
-            code_lines.append(line)
-
-    return '\n'.join(code_lines)
-
-def run_blender_script(script_code, object_name):
-    """Run the Blender script to generate STL."""
-    print(f"🎨 Generating 3D model for: {object_name}")
-
-    # Create temporary Python script file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(script_code)
-        script_path = f.name
-
-    try:
-        # Run Blender with the script
-        cmd = ['blender', '--background', '--python', script_path]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-
-        if result.returncode == 0:
-            print("✅ STL generation completed successfully")
-            return True
-        else:
-            print(f"❌ Blender script failed:")
-            print(f"   stdout: {result.stdout[-200:] if result.stdout else 'None'}")
-            print(f"   stderr: {result.stderr[-200:] if result.stderr else 'None'}")
-            return False
-
-    except subprocess.TimeoutExpired:
-        print("⏰ Blender script timed out (60s limit)")
-        return False
-    except FileNotFoundError:
-        print("❌ Error: Blender not found. Please install Blender and add it to PATH.")
-        return False
-    finally:
-        # Clean up temporary script file
-        try:
-            os.unlink(script_path)
-        except:
-            pass
-
-def render_stl_to_image(output_image='render.png'):
-    """Render STL file to image using Blender."""
-    print(f"📷 Rendering STL to image: {output_image}")
-
-    if not os.path.exists('duck.stl'):
-        print("❌ Error: duck.stl not found")
-        return False
+    """Extract Python code from the output text (removes markdown formatting).
 
-    # Blender command to import STL and render
-    blender_expr = f"""
+    Only lines holding a ``` fence need inspecting, so str.find jumps from
+    fence to fence in C and each code block is sliced out whole instead of
+    being split and rejoined line by line.
+    """
+    pieces = []
+    in_code_block = False
+    block_start = 0
+
+    pos = output_text.find('```')
+    while pos != -1:
+        line_start = output_text.rfind('\n', 0, pos) + 1
+        line_end = output_text.find('\n', pos)
+        if line_end == -1:
+            line_end = len(output_text)
+
+        # A fence must open its line (after indentation) to count
+        if not output_text[line_start:pos].strip():
+            marker = output_text[line_start:line_end].strip()
+            if marker.startswith('```python'):
+                if in_code_block and line_start > block_start:
+                    pieces.append(output_text[block_start:line_start - 1])
+                in_code_block = True
+                block_start = line_end + 1
+            elif marker == '```' and in_code_block:
+                if line_start > block_start:
+                    pieces.append(output_text[block_start:line_start - 1])
+                in_code_block = False
+
+        pos = output_text.find('```', line_end)
+
+    if in_code_block and block_start <= len(output_text):
+        pieces.append(output_text[block_start:])
+
+    return '\n'.join(pieces)
+
+def output_tail(data, limit):
+    """Decode only the last `limit` bytes of captured Blender output."""
+    return data[-limit:].decode('utf-8', errors='replace') if data else 'None'
+
+def build_render_expr(output_image):
+    """Blender Python that imports duck.stl and renders it to output_image."""
+    return f"""
 import bpy
 import bmesh
 
-# Clear default objects
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete(use_global=False)
+# Clear everything the generation script left behind, including objects
+# hidden with hide_set/hide_viewport that select_all + delete would skip
+for obj in list(bpy.data.objects):
+    bpy.data.objects.remove(obj, do_unlink=True)
 
 # Import STL
 bpy.ops.import_mesh.stl(filepath='duck.stl')
@@ -136,25 +124,44 @@ bpy.context.scene.render.filepath = '{output_image}'
 bpy.ops.render.render(write_still=True)
 """
 
+def generate_and_render(script_code, object_name, output_image='render.png'):
+    """Generate the STL and render it in a single Blender process.
+
+    Blender's startup dominates for small models, so both stages share one
+    launch: the generation script runs first, then the render expression.
+    --python-exit-code makes a failing stage abort the process.
+    """
+    print(f"🎨 Generating 3D model for: {object_name}")
+
+    # Drop a stale model so a script that writes nothing is caught below
+    if os.path.exists('duck.stl'):
+        os.unlink('duck.stl')
+
     try:
-        cmd = ['blender', '--background', '--python-expr', blender_expr]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        cmd = [
+            'blender', '--background', '--python-exit-code', '1',
+            '--python-expr', script_code,
+            '--python-expr', build_render_expr(output_image),
+        ]
+        result = subprocess.run(cmd, capture_output=True, timeout=180)
 
         if result.returncode == 0 and os.path.exists(output_image):
+            print("✅ STL generation completed successfully")
             print(f"✅ Render completed: {output_image}")
             return True
-        else:
-            print(f"❌ Rendering failed:")
-            print(f"   Return code: {result.returncode}")
-            if result.stderr:
-                print(f"   Error: {result.stderr[-300:]}")
-            return False
+
+        stage = "Rendering" if os.path.exists('duck.stl') else "Blender script"
+        print(f"❌ {stage} failed:")
+        print(f"   Return code: {result.returncode}")
+        print(f"   stdout: {output_tail(result.stdout, 200)}")
+        print(f"   stderr: {output_tail(result.stderr, 300)}")
+        return False
 
     except subprocess.TimeoutExpired:
-        print("⏰ Rendering timed out (120s limit)")
+        print("⏰ Blender timed out (180s limit)")
         return False
     except FileNotFoundError:
-        print("❌ Error: Blender not found")
+        print("❌ Error: Blender not found. Please install Blender and add it to PATH.")
         return False
 
 def display_image(image_path):
@@ -191,12 +198,9 @@ def main():
 
     # Select object
     if args.object_name:
-        # Find specific object
-        selected_script = None
-        for script in scripts:
-            if script['input'] == args.object_name:
-                selected_script = script
-                break
+        # Index by name; built from the end so the first duplicate wins
+        by_name = {script['input']: script for script in reversed(scripts)}
+        selected_script = by_name.get(args.object_name)
 
         if not selected_script:
             print(f"❌ Object '{args.object_name}' not found")
@@ -217,12 +221,8 @@ def main():
         print("❌ No valid Python code found in script output")
         return
 
-    # Generate STL
-    if not run_blender_script(script_code, object_name):
-        return
-
-    # Render image
-    if not render_stl_to_image(args.output):
+    # Generate STL and render image with one Blender launch
+    if not generate_and_render(script_code, object_name, args.output):
         return
 
     # Display image
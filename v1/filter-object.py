@@ -8,23 +8,134 @@ adjacent objects with good names.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import random
+import re
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
+
+# llm_cache.py lives next to generate-entity.py, one directory up
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from llm_cache import LLMCache
+
+# The few-shot blocks and system prompt are fixed, so every request shares a
+# byte-identical prefix and only the object name at the tail varies. That lets
+# Ollama reuse the cached prefix instead of re-evaluating it on every call.
+FILTER_SYSTEM = "You are a helpful assistant that completes patterns directly. No explanations needed. Respond only in plain text, no markdown formatting."
+
+REPHRASE_PREFIX = """Complete the pattern with a proper object description (adjective + noun). 2-5 words only. No thinking, just the answer. No markdown formatting, only plain text:
+
+abs bag -> leather handbag
+abs chair -> wooden chair
+abs lamp -> desk lamp
+abs bowl -> ceramic bowl
+abs bottle -> glass bottle
+abs table -> oak table
+abs mirror -> wall mirror
+abs clock -> grandfather clock
+abs basket -> wicker basket
+abs bed -> queen bed
+
+"""
+
+ADJACENT_PREFIX = """Complete the pattern with a proper object description (adjective + noun). 2-5 words only. No thinking, just the answer. No markdown formatting, only plain text:
+
+leather handbag -> leather wallet
+wooden chair -> wooden table
+desk lamp -> desk organizer
+ceramic bowl -> wooden spoon
+glass bottle -> wine glass
+oak table -> wooden chairs
+wall mirror -> wall sconces
+grandfather clock -> wall clock
+wicker basket -> picnic blanket
+queen bed -> down pillow
+
+"""
+
+# Model-free answers, keyed by the object's last word
+REPHRASE_FALLBACK = {
+    "bag": "leather handbag",
+    "chair": "wooden chair",
+    "lamp": "desk lamp",
+    "bowl": "ceramic bowl",
+    "basket": "wicker basket",
+    "bed": "queen bed",
+    "bottle": "glass bottle",
+    "box": "wooden box",
+    "table": "oak table",
+    "mirror": "wall mirror",
+    "clock": "grandfather clock",
+}
+
+# Model-free adjacent objects; the first keyword found in the rephrased
+# object wins, so order matters ("bag" also covers "handbag")
+ADJACENT_FALLBACK = {
+    "bag": "leather wallet",
+    "chair": "wooden table",
+    "lamp": "desk organizer",
+    "bowl": "wooden spoon",
+    "basket": "picnic blanket",
+    "bed": "down pillow",
+    "bottle": "wine glass",
+    "box": "storage lid",
+    "table": "wooden chairs",
+    "mirror": "wall sconces",
+    "clock": "wall clock",
+}
+
+# Server responses worth retrying, and how many tries each request gets
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_ATTEMPTS = 3
+
+BATCH_INSTRUCTION = "Complete each numbered line below the same way, answering one per line as: 1) answer"
+
+# Single answers end at a blank line; batch replies must run on past one,
+# since models often leave a blank line between numbered answers
+SINGLE_STOP = ["<think>", "\n\n"]
+BATCH_STOP = ["<think>"]
+
+# A numbered answer line such as "3) wooden chair" or "3. abs chair -> wooden chair"
+_NUMBERED_RE = re.compile(r"^\s*(\d+)[.)]\s*(.+?)\s*$", re.MULTILINE)
+
 
 class ObjectFilter:
-    def __init__(self, ollama_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        ollama_url: str = "http://localhost:11434",
+        concurrency: int = 8,
+        batch_size: int = 8,
+        cache_path: Optional[Path] = Path("filter_cache.db"),
+    ):
         self.ollama_url = ollama_url
+        self.concurrency = max(1, concurrency)
+        # Objects completed per request; 1 falls back to one call per object
+        self.batch_size = max(1, batch_size)
+        
+        # Reuse keep-alive connections across every Ollama call; the pool is
+        # sized so each concurrent worker gets its own connection.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10, pool_maxsize=max(10, self.concurrency), max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.model = "gemma3:1b"  # Using qwen2.5:4b as qwen3:4b might not be available
         self.input_file = "objects.txt"
         self.output_file = "filtered_objects.txt"
+        # objects.txt repeats many names and sampling is near-greedy, so
+        # identical prompts reuse the stored answer. None disables the cache.
+        self.cache = LLMCache(cache_path) if cache_path else None
         
     def check_ollama_connection(self) -> bool:
         """Check if Ollama is running and the model is available."""
         try:
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.ollama_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 model_names = [model["name"] for model in models]
@@ -41,108 +152,215 @@ class ObjectFilter:
             print(f"✗ Cannot connect to Ollama: {e}")
             return False
     
-    def call_ollama(self, prompt: str) -> Optional[str]:
-        """Call Ollama API to get response from the model."""
-        try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "system": "You are a helpful assistant that completes patterns directly. No explanations needed. Respond only in plain text, no markdown formatting.",
-                "options": {
-                    "temperature": 0.1,  # Lower temperature for consistency
-                    "top_p": 0.9,
-                    "num_predict": 80,   # Allow more tokens for longer descriptions
-                    "stop": ["<think>", "\n\n"]  # Only stop on thinking or double newline
-                }
+    def build_payload(self, prompt: str, num_predict: int = 80,
+                      stop: List[str] = SINGLE_STOP) -> Dict[str, Any]:
+        """Build the /api/generate request for a prompt."""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "system": FILTER_SYSTEM,
+            "options": {
+                "temperature": 0.1,  # Lower temperature for consistency
+                "top_p": 0.9,
+                "num_predict": num_predict,   # Allow more tokens for longer descriptions
+                "stop": stop  # Only stop on thinking (or double newline for single answers)
             }
+        }
+    
+    def post_generate(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Send a generate request and return the raw response text.
 
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json=payload,
-                timeout=30  # Add reasonable timeout
-            )
+        Busy or failing servers (429/5xx) are retried with exponential
+        backoff and jitter; anything else fails immediately.
+        """
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                response = self.session.post(
+                    f"{self.ollama_url}/api/generate",
+                    json=payload,
+                    timeout=30  # Add reasonable timeout
+                )
 
-            if response.status_code == 200:
-                result = response.json()
-                response_text = result.get("response", "").strip()
-
-                print(f"    Raw response: '{response_text}'")
-
-                # Handle thinking tags more carefully
-                if "<think>" in response_text and "</think>" in response_text:
-                    # Extract text after </think>
-                    response_text = response_text.split("</think>")[-1].strip()
-                elif "<think>" in response_text:
-                    # If unclosed think tag, remove everything up to it
-                    response_text = response_text.split("<think>")[0].strip()
-
-                # Extract answer after arrow if present
-                if "->" in response_text:
-                    response_text = response_text.split("->")[-1].strip()
-
-                # Clean up quotes, extra whitespace, and any markdown formatting
-                response_text = response_text.strip('"\'  \n\r\t')
-                # Remove any markdown formatting
-                response_text = response_text.replace('*', '').replace('_', '').replace('`', '').replace('#', '')
-
-                # Take first line if multiple lines
-                if '\n' in response_text:
-                    response_text = response_text.split('\n')[0].strip()
-
-                # Validate response
-                if not response_text:
-                    print(f"    Warning: Empty response")
-                    return None
-                elif len(response_text) > 80:
-                    print(f"    Warning: Response too long: '{response_text[:50]}...'")
-                    return None
-                elif len(response_text.split()) > 5:
-                    print(f"    Warning: Too many words: '{response_text}'")
+                if response.status_code == 200:
+                    result = response.json()
+                    return result.get("response", "").strip()
+                elif response.status_code in RETRY_STATUSES and attempt + 1 < RETRY_ATTEMPTS:
+                    time.sleep((2 ** attempt) * 0.1 + random.random() * 0.1)
+                else:
+                    print(f"✗ Ollama API error: {response.status_code} - {response.text}")
                     return None
 
-                return response_text
-            else:
-                print(f"✗ Ollama API error: {response.status_code} - {response.text}")
+            except requests.exceptions.RequestException as e:
+                print(f"✗ Error calling Ollama: {e}")
                 return None
+        return None
+    
+    def clean_response(self, response_text: str) -> Optional[str]:
+        """Reduce a model answer to a short object name, or None if unusable."""
+        # Handle thinking tags more carefully
+        if "<think>" in response_text and "</think>" in response_text:
+            # Extract text after </think>
+            response_text = response_text.split("</think>")[-1].strip()
+        elif "<think>" in response_text:
+            # If unclosed think tag, remove everything up to it
+            response_text = response_text.split("<think>")[0].strip()
 
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Error calling Ollama: {e}")
+        # Extract answer after arrow if present
+        if "->" in response_text:
+            response_text = response_text.split("->")[-1].strip()
+
+        # Clean up quotes, extra whitespace, and any markdown formatting
+        response_text = response_text.strip('"\'  \n\r\t')
+        # Remove any markdown formatting
+        response_text = response_text.replace('*', '').replace('_', '').replace('`', '').replace('#', '')
+
+        # Take first line if multiple lines
+        if '\n' in response_text:
+            response_text = response_text.split('\n')[0].strip()
+
+        # Validate response
+        if not response_text:
+            print(f"    Warning: Empty response")
+            return None
+        elif len(response_text) > 80:
+            print(f"    Warning: Response too long: '{response_text[:50]}...'")
+            return None
+        elif len(response_text.split()) > 5:
+            print(f"    Warning: Too many words: '{response_text}'")
             return None
+
+        return response_text
     
-    def create_rephrase_prompt(self, object_name: str) -> str:
-        """Create a prompt to rephrase the object into a common name under 5 words."""
-        return f"""Complete the pattern with a proper object description (adjective + noun). 2-5 words only. No thinking, just the answer. No markdown formatting, only plain text:
+    def cached_answer(self, prompt: str) -> Optional[str]:
+        """A valid cached answer for a single-item prompt, if any.
 
-abs bag -> leather handbag
-abs chair -> wooden chair
-abs lamp -> desk lamp
-abs bowl -> ceramic bowl
-abs bottle -> glass bottle
-abs table -> oak table
-abs mirror -> wall mirror
-abs clock -> grandfather clock
-abs basket -> wicker basket
-abs bed -> queen bed
+        Only cleaned answers are stored, but they are cleaned again so
+        entries written by older versions cannot replay a bad answer.
+        """
+        if not self.cache:
+            return None
+        cached = self.cache.get(LLMCache.make_key(self.build_payload(prompt)))
+        return self.clean_response(cached) if cached else None
+
+    def cache_answer(self, prompt: str, answer: Optional[str]) -> None:
+        """Store a cleaned answer under its single-item prompt."""
+        if answer and self.cache:
+            self.cache.set(LLMCache.make_key(self.build_payload(prompt)), answer)
+
+    def call_ollama(self, prompt: str, check_cache: bool = True) -> Optional[str]:
+        """Call Ollama API to get response from the model."""
+        cached = self.cached_answer(prompt) if check_cache else None
+        if cached:
+            return cached
 
-{object_name} ->"""
+        response_text = self.post_generate(self.build_payload(prompt))
+        if response_text is None:
+            return None
+
+        print(f"    Raw response: '{response_text}'")
+        response_text = self.clean_response(response_text)
+
+        self.cache_answer(prompt, response_text)
+        return response_text
     
-    def create_adjacent_prompt(self, rephrased_object: str) -> str:
-        """Create a prompt to generate an adjacent object."""
-        return f"""Complete the pattern with a proper object description (adjective + noun). 2-5 words only. No thinking, just the answer. No markdown formatting, only plain text:
+    def call_ollama_batch(self, prefix: str, items: List[str]) -> List[Optional[str]]:
+        """Complete several pattern lines with one request.
 
-leather handbag -> leather wallet
-wooden chair -> wooden table
-desk lamp -> desk organizer
-ceramic bowl -> wooden spoon
-glass bottle -> wine glass
-oak table -> wooden chairs
-wall mirror -> wall sconces
-grandfather clock -> wall clock
-wicker basket -> picnic blanket
-queen bed -> down pillow
+        Returns one cleaned answer per item, None where the numbered reply
+        was missing or unusable.
+        """
+        payload = self.build_payload(
+            self.create_batch_prompt(prefix, items), num_predict=20 * len(items),
+            stop=BATCH_STOP,
+        )
+
+        response_text = self.post_generate(payload)
+        if response_text is None:
+            return [None] * len(items)
+        print(f"    Raw batch response: '{response_text}'")
+
+        answers: List[Optional[str]] = [None] * len(items)
+        for match in _NUMBERED_RE.finditer(response_text):
+            index = int(match.group(1)) - 1
+            if 0 <= index < len(items) and answers[index] is None:
+                answers[index] = self.clean_response(match.group(2))
+        return answers
+    
+    def complete_batch(
+        self, prefix: str, create_prompt: Callable[[str], str], items: List[str]
+    ) -> List[Optional[str]]:
+        """Complete a batch of items, retrying the batch's misses one by one.
 
-{rephrased_object} ->"""
+        Answers are cached per item under its single-item prompt, so only
+        items without a cached answer go into the batch request.
+        """
+        answers = [self.cached_answer(create_prompt(item)) for item in items]
+        missing = [index for index, answer in enumerate(answers) if not answer]
+        if len(missing) > 1:
+            batch_answers = self.call_ollama_batch(prefix, [items[index] for index in missing])
+            for index, answer in zip(missing, batch_answers):
+                answers[index] = answer
+                self.cache_answer(create_prompt(items[index]), answer)
+        for index in missing:
+            if not answers[index]:
+                answers[index] = self.call_ollama(create_prompt(items[index]), check_cache=False)
+        return answers
+    
+    def create_rephrase_prompt(self, object_name: str) -> str:
+        """Create a prompt to rephrase the object into a common name under 5 words."""
+        return f"{REPHRASE_PREFIX}{object_name} ->"
+    
+    def create_adjacent_prompt(self, rephrased_object: str) -> str:
+        """Create a prompt to generate an adjacent object."""
+        return f"{ADJACENT_PREFIX}{rephrased_object} ->"
+    
+    def create_batch_prompt(self, prefix: str, items: List[str]) -> str:
+        """Create a prompt that completes each item as a numbered line."""
+        numbered = "\n".join(f"{i}) {item} ->" for i, item in enumerate(items, start=1))
+        return f"{prefix}{BATCH_INSTRUCTION}\n\n{numbered}\n"
+    
+    def fallback_rephrase(self, original_object: str) -> str:
+        """Rephrase an object without the model."""
+        # Fallback: use intelligent conversion with proper object descriptions
+        base_word = original_object.split()[-1] if ' ' in original_object else original_object
+        return REPHRASE_FALLBACK.get(base_word, f"wooden {base_word}")
+    
+    def fallback_adjacent(self, rephrased: str) -> str:
+        """Pick an adjacent object without the model."""
+        # Fallback: use intelligent related objects with proper object descriptions
+        rephrased = rephrased.lower()
+        for keyword, adjacent in ADJACENT_FALLBACK.items():
+            if keyword in rephrased:
+                return adjacent
+        return "wooden item"
+    
+    def process_batch(self, objects: List[str]) -> List[Tuple[str, str]]:
+        """Rephrase a batch of objects and generate their adjacent objects."""
+        for original_object in objects:
+            print(f"\nProcessing: {original_object}")
+        
+        # Step 1: Rephrase the objects
+        rephrased_objects = self.complete_batch(REPHRASE_PREFIX, self.create_rephrase_prompt, objects)
+        for index, original_object in enumerate(objects):
+            if not rephrased_objects[index]:
+                print(f"  ✗ Failed to rephrase: {original_object}")
+                rephrased_objects[index] = self.fallback_rephrase(original_object)
+                print(f"  → Fallback rephrased: {rephrased_objects[index]}")
+            print(f"  → Rephrased: {original_object} → {rephrased_objects[index]}")
+        
+        # Step 2: Generate adjacent objects
+        adjacent_objects = self.complete_batch(
+            ADJACENT_PREFIX, self.create_adjacent_prompt, rephrased_objects
+        )
+        for index, rephrased in enumerate(rephrased_objects):
+            if not adjacent_objects[index]:
+                print(f"  ✗ Failed to generate adjacent object")
+                adjacent_objects[index] = self.fallback_adjacent(rephrased)
+                print(f"  → Fallback adjacent: {adjacent_objects[index]}")
+            print(f"  → Adjacent: {rephrased} → {adjacent_objects[index]}")
+        
+        return list(zip(rephrased_objects, adjacent_objects))
     
     def process_objects(self, start_line: int = 1, max_lines: int = 100) -> None:
         """Process objects from the input file."""
@@ -156,112 +374,48 @@ queen bed -> down pillow
             return
         
         print(f"Processing objects from line {start_line} to {start_line + max_lines - 1}")
+        print(f"Using batches of {self.batch_size} with {self.concurrency} concurrent requests")
         print("=" * 60)
         
-        with open(input_path, 'r', encoding='utf-8') as infile, \
-             open(self.output_file, 'w', encoding='utf-8') as outfile:
-            
-            # Skip to start line
-            for _ in range(start_line - 1):
-                infile.readline()
-            
-            processed = 0
-            for line_num, line in enumerate(infile, start=start_line):
-                if processed >= max_lines:
+        # Read the requested objects up front so they can be processed concurrently
+        objects = []
+        with open(input_path, 'r', encoding='utf-8') as infile:
+            for line in islice(infile, max(0, start_line - 1), None):
+                if len(objects) >= max_lines:
                     break
-                
                 original_object = line.strip()
-                if not original_object:
-                    continue
-                
-                print(f"\n[{line_num}] Processing: {original_object}")
-                
-                # Step 1: Rephrase the object
-                rephrase_prompt = self.create_rephrase_prompt(original_object)
-                rephrased = self.call_ollama(rephrase_prompt)
-                
-                if not rephrased:
-                    print(f"  ✗ Failed to rephrase: {original_object}")
-                    # Fallback: use intelligent conversion with proper object descriptions
-                    base_word = original_object.split()[-1] if ' ' in original_object else original_object
-                    if base_word == "bag":
-                        rephrased = "leather handbag"
-                    elif base_word == "chair":
-                        rephrased = "wooden chair"
-                    elif base_word == "lamp":
-                        rephrased = "desk lamp"
-                    elif base_word == "bowl":
-                        rephrased = "ceramic bowl"
-                    elif base_word == "basket":
-                        rephrased = "wicker basket"
-                    elif base_word == "bed":
-                        rephrased = "queen bed"
-                    elif base_word == "bottle":
-                        rephrased = "glass bottle"
-                    elif base_word == "box":
-                        rephrased = "wooden box"
-                    elif base_word == "table":
-                        rephrased = "oak table"
-                    elif base_word == "mirror":
-                        rephrased = "wall mirror"
-                    elif base_word == "clock":
-                        rephrased = "grandfather clock"
-                    else:
-                        rephrased = f"wooden {base_word}"
-                    print(f"  → Fallback rephrased: {rephrased}")
-                
-                print(f"  → Rephrased: {rephrased}")
-                
-                # Step 2: Generate adjacent object
-                adjacent_prompt = self.create_adjacent_prompt(rephrased)
-                adjacent = self.call_ollama(adjacent_prompt)
-                
-                if not adjacent:
-                    print(f"  ✗ Failed to generate adjacent object")
-                    # Fallback: use intelligent related objects with proper object descriptions
-                    if 'bag' in rephrased.lower() or 'handbag' in rephrased.lower():
-                        adjacent = "leather wallet"
-                    elif 'chair' in rephrased.lower():
-                        adjacent = "wooden table"
-                    elif 'lamp' in rephrased.lower():
-                        adjacent = "desk organizer"
-                    elif 'bowl' in rephrased.lower():
-                        adjacent = "wooden spoon"
-                    elif 'basket' in rephrased.lower():
-                        adjacent = "picnic blanket"
-                    elif 'bed' in rephrased.lower():
-                        adjacent = "down pillow"
-                    elif 'bottle' in rephrased.lower():
-                        adjacent = "wine glass"
-                    elif 'box' in rephrased.lower():
-                        adjacent = "storage lid"
-                    elif 'table' in rephrased.lower():
-                        adjacent = "wooden chairs"
-                    elif 'mirror' in rephrased.lower():
-                        adjacent = "wall sconces"
-                    elif 'clock' in rephrased.lower():
-                        adjacent = "wall clock"
-                    else:
-                        adjacent = "wooden item"
-                    print(f"  → Fallback adjacent: {adjacent}")
-                
-                print(f"  → Adjacent: {adjacent}")
-                
-                # Write results - one object per line
-                outfile.write(f"{rephrased}\n")
-                outfile.write(f"{adjacent}\n")
-                outfile.flush()
-                
-                processed += 1
-                
-                # Add small delay to avoid overwhelming the API
-                time.sleep(0.5)
-                
-                if processed % 10 == 0:
-                    print(f"  ✓ Processed {processed} objects so far...")
+                if original_object:
+                    objects.append(original_object)
+        
+        batches = [
+            objects[i : i + self.batch_size]
+            for i in range(0, len(objects), self.batch_size)
+        ]
+        
+        processed = 0
+        with open(self.output_file, 'w', encoding='utf-8', buffering=1 << 20) as outfile, \
+             ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            
+            # map() yields in input order, so the output keeps the file's order
+            # while later batches are already in flight
+            for results in executor.map(self.process_batch, batches):
+                for rephrased, adjacent in results:
+                    # Write results - one object per line
+                    outfile.write(f"{rephrased}\n{adjacent}\n")
+                    
+                    processed += 1
+                    
+                    if processed % 10 == 0:
+                        print(f"  ✓ Processed {processed} objects so far...")
+                    
+                    # Flush periodically so an interrupted run keeps most of its output
+                    if processed % 100 == 0:
+                        outfile.flush()
         
         print(f"\n✓ Processing complete! Results saved to {self.output_file}")
         print(f"✓ Processed {processed} objects")
+        if self.cache:
+            print(f"✓ Response cache: {self.cache.stats['hits']} hits, {self.cache.stats['misses']} misses")
 
 def main():
     """Main function to run the object filter."""
@@ -271,6 +425,8 @@ def main():
     # Parse command line arguments
     start_line = 1
     max_lines = 100
+    concurrency = 8
+    batch_size = 8
     
     if len(sys.argv) > 1:
         try:
@@ -284,8 +440,20 @@ def main():
         except ValueError:
             print("Invalid max lines number. Using default: 100")
     
+    if len(sys.argv) > 3:
+        try:
+            concurrency = int(sys.argv[3])
+        except ValueError:
+            print("Invalid concurrency. Using default: 8")
+    
+    if len(sys.argv) > 4:
+        try:
+            batch_size = int(sys.argv[4])
+        except ValueError:
+            print("Invalid batch size. Using default: 8")
+    
     # Create and run the filter
-    filter_obj = ObjectFilter()
+    filter_obj = ObjectFilter(concurrency=concurrency, batch_size=batch_size)
     filter_obj.process_objects(start_line=start_line, max_lines=max_lines)
 
 if __name__ == "__main__":
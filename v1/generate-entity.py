@@ -3,532 +3,245 @@
 Generate 100,000+ 3D objects through systematic expansion.
 """
 
-def generate_object_list():
-    """Generate a comprehensive list of 100,000+ 3D object names."""
-    
-    # Read from existing objects.txt if available
+import functools
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import sys
+from itertools import chain, groupby, product
+from pathlib import Path
+
+VOCAB_FILE = Path(__file__).with_name('vocab.json')
+OBJECTS_FILE = Path('objects.txt')
+
+
+def _load_vocab():
+    """Read vocab.json into order-preserving, deduplicated tuples.
+
+    Words are interned, so the many vocabularies that share tokens hold one
+    string object per word and compare by identity when deduplicated.
+    """
+    return {
+        name: tuple(dict.fromkeys(map(sys.intern, words)))
+        for name, words in json.loads(VOCAB_FILE.read_bytes()).items()
+    }
+
+
+# Vocabularies are loaded once at import and shared by every call
+_VOCAB = _load_vocab()
+_FURNITURE = _VOCAB['furniture']
+_VEHICLES = _VOCAB['vehicles']
+_TOOLS = _VOCAB['tools']
+_ELECTRONICS = _VOCAB['electronics']
+_KITCHEN = _VOCAB['kitchen']
+_HOUSEHOLD = _VOCAB['household']
+_APPLIANCES = _VOCAB['appliances']
+_SPORTS = _VOCAB['sports']
+_MUSICAL = _VOCAB['musical']
+_OFFICE = _VOCAB['office']
+_CLOTHING = _VOCAB['clothing']
+_JEWELRY = _VOCAB['jewelry']
+_TOYS = _VOCAB['toys']
+_MEDICAL = _VOCAB['medical']
+_GARDEN = _VOCAB['garden']
+_ART_SUPPLIES = _VOCAB['art_supplies']
+_AUTOMOTIVE = _VOCAB['automotive']
+_BUILDING_MATERIALS = _VOCAB['building_materials']
+_FOOD_ITEMS = _VOCAB['food_items']
+_PLANTS = _VOCAB['plants']
+_CONTAINERS = _VOCAB['containers']
+_FABRICS = _VOCAB['fabrics']
+_HARDWARE = _VOCAB['hardware']
+_LABORATORY = _VOCAB['laboratory']
+_LIGHTING = _VOCAB['lighting']
+_MECHANICAL = _VOCAB['mechanical']
+_MATERIALS = _VOCAB['materials']
+_COLORS = _VOCAB['colors']
+_SIZES = _VOCAB['sizes']
+_STYLES = _VOCAB['styles']
+_MODIFIERS = _VOCAB['modifiers']
+_CONDITIONS = _VOCAB['conditions']
+_ROOMS = _VOCAB['rooms']
+_KEY_OBJECTS = _VOCAB['key_objects']
+_BRANDS = _VOCAB['brands']
+_SPECS = _VOCAB['specs']
+
+# The single-attribute vocabularies overlap ('cherry', 'silver', 'office',
+# 'vintage', ...), so merge them once and expand each attribute only once.
+_ATTRIBUTES = tuple(dict.fromkeys(
+    _MATERIALS + _COLORS + _SIZES + _STYLES + _MODIFIERS + _CONDITIONS + _ROOMS
+))
+
+
+def product_join(*vocabularies):
+    """Lazily yield every space-joined combination across the vocabularies.
+
+    The cartesian product and the joins both run in C; nothing is built until
+    the caller consumes the iterator.
+    """
+    return map(' '.join, product(*vocabularies))
+
+
+def load_existing_objects():
+    """Return the names in objects.txt if it already holds 100,000+ of them."""
     try:
-        with open('objects.txt', 'r') as f:
+        with OBJECTS_FILE.open('r') as f:
             objects = [line.strip() for line in f if line.strip()]
         if len(objects) >= 100000:
             return objects
     except FileNotFoundError:
         pass
-    
-    # If file doesn't exist or has fewer than 100k objects, generate new list
-    all_objects = set()
-    
-    # Massively expanded base categories
-    furniture = [
-        'chair', 'table', 'bed', 'sofa', 'desk', 'shelf', 'cabinet', 'bench', 'stool', 
-        'dresser', 'nightstand', 'wardrobe', 'bookcase', 'credenza', 'ottoman', 'armchair', 
-        'recliner', 'loveseat', 'sectional', 'futon', 'accent chair', 'bar stool', 
-        'counter stool', 'piano bench', 'park bench', 'dining chair', 'office chair', 
-        'rocking chair', 'folding chair', 'swivel chair', 'coffee table', 'dining table', 
-        'end table', 'side table', 'console table', 'conference table', 'kitchen table', 
-        'picnic table', 'drafting table', 'single bed', 'twin bed', 'full bed', 
-        'queen bed', 'king bed', 'daybed', 'bunk bed', 'loft bed', 'murphy bed',
-        'platform bed', 'canopy bed', 'sleigh bed', 'poster bed', 'panel bed',
-        'storage bed', 'trundle bed', 'sofa bed', 'captain bed', 'race car bed'
-    ]
-    
-    vehicles = [
-        'car', 'sedan', 'hatchback', 'coupe', 'convertible', 'wagon', 'suv', 'crossover',
-        'minivan', 'pickup truck', 'sports car', 'luxury car', 'police car', 'taxi',
-        'ambulance', 'fire truck', 'limousine', 'race car', 'motorcycle', 'scooter',
-        'bicycle', 'truck', 'delivery truck', 'dump truck', 'garbage truck', 'tow truck',
-        'bus', 'school bus', 'city bus', 'tour bus', 'airplane', 'jet', 'helicopter',
-        'boat', 'yacht', 'sailboat', 'motorboat', 'speedboat', 'canoe', 'kayak',
-        'tricycle', 'unicycle', 'mountain bike', 'road bike', 'hybrid bike', 'bmx bike',
-        'electric bike', 'tandem bike', 'folding bike', 'cargo bike', 'cruiser bike',
-        'atv', 'utv', 'snowmobile', 'jet ski', 'personal watercraft', 'pontoon boat',
-        'fishing boat', 'cabin cruiser', 'bowrider', 'ski boat', 'wake boat',
-        'catamaran', 'trimaran', 'houseboat', 'tugboat', 'barge', 'ferry'
-    ]
-    
-    tools = [
-        'hammer', 'screwdriver', 'wrench', 'pliers', 'saw', 'drill', 'chisel',
-        'file', 'sandpaper', 'level', 'measuring tape', 'ruler', 'square',
-        'crowbar', 'axe', 'pickaxe', 'shovel', 'rake', 'hoe', 'spade',
-        'circular saw', 'jigsaw', 'angle grinder', 'belt sander', 'router',
-        'socket wrench', 'allen wrench', 'pipe wrench', 'needle nose pliers',
-        'claw hammer', 'ball peen hammer', 'sledge hammer', 'framing hammer',
-        'dead blow hammer', 'rubber mallet', 'wooden mallet', 'combination wrench',
-        'box wrench', 'open end wrench', 'torque wrench', 'basin wrench',
-        'strap wrench', 'chain wrench', 'adjustable wrench', 'ratcheting wrench',
-        'slip joint pliers', 'locking pliers', 'wire cutters', 'diagonal cutters',
-        'lineman pliers', 'fence pliers', 'crimping pliers', 'welding pliers'
-    ]
-    
-    electronics = [
-        'computer', 'laptop', 'desktop', 'tablet', 'smartphone', 'phone', 'camera',
-        'television', 'monitor', 'speaker', 'headphones', 'microphone', 'radio',
-        'stereo', 'amplifier', 'receiver', 'turntable', 'cd player', 'dvd player',
-        'projector', 'printer', 'scanner', 'router', 'modem', 'keyboard', 'mouse',
-        'gaming console', 'handheld console', 'vr headset', 'smartwatch', 'fitness tracker',
-        'bluetooth speaker', 'soundbar', 'subwoofer', 'bookshelf speaker', 'floor speaker',
-        'wireless headphones', 'earbuds', 'gaming headset', 'webcam', 'action camera',
-        'security camera', 'doorbell camera', 'dash cam', 'drone', 'rc car',
-        'smart tv', 'streaming device', 'media player', 'game controller', 'joystick'
-    ]
-    
-    kitchen = [
-        'pot', 'pan', 'skillet', 'saucepan', 'stockpot', 'dutch oven', 'wok',
-        'knife', 'chef knife', 'paring knife', 'bread knife', 'fork', 'spoon',
-        'spatula', 'whisk', 'ladle', 'tongs', 'peeler', 'grater', 'can opener',
-        'bottle opener', 'corkscrew', 'measuring cup', 'mixing bowl', 'cutting board',
-        'colander', 'strainer', 'timer', 'thermometer', 'scale', 'blender',
-        'food processor', 'mixer', 'toaster', 'coffee maker', 'kettle', 'teapot',
-        'pressure cooker', 'slow cooker', 'rice cooker', 'steamer', 'double boiler',
-        'roasting pan', 'baking dish', 'casserole dish', 'grill pan', 'crepe pan',
-        'omelet pan', 'paella pan', 'tagine', 'griddle', 'carving knife',
-        'utility knife', 'boning knife', 'fillet knife', 'cleaver', 'steak knife'
-    ]
-    
-    household = [
-        'lamp', 'mirror', 'vase', 'bowl', 'plate', 'cup', 'mug', 'glass', 'bottle',
-        'clock', 'picture', 'frame', 'box', 'basket', 'bin', 'container', 'jar',
-        'bag', 'purse', 'wallet', 'case', 'pillow', 'cushion', 'blanket', 'towel',
-        'curtain', 'blind', 'rug', 'carpet', 'doormat', 'umbrella', 'candle',
-        'candlestick', 'ashtray', 'coaster', 'tissue box', 'trash can', 'hamper',
-        'laundry basket', 'storage basket', 'picnic basket', 'fruit basket',
-        'bread basket', 'wastepaper basket', 'toy box', 'storage box', 'jewelry box',
-        'tool box', 'lunch box', 'music box', 'recycling bin', 'compost bin'
-    ]
-    
-    appliances = [
-        'refrigerator', 'oven', 'microwave', 'dishwasher', 'washing machine',
-        'dryer', 'air conditioner', 'heater', 'vacuum cleaner', 'iron',
-        'french door refrigerator', 'side by side refrigerator', 'top freezer refrigerator',
-        'bottom freezer refrigerator', 'mini fridge', 'wine refrigerator', 'beverage cooler',
-        'ice maker', 'water dispenser', 'gas oven', 'electric oven', 'convection oven',
-        'toaster oven', 'countertop oven', 'steam oven', 'combination oven', 'pizza oven'
-    ]
-    
-    sports = [
-        'baseball', 'basketball', 'football', 'soccer ball', 'tennis ball',
-        'golf ball', 'volleyball', 'hockey puck', 'bat', 'racket', 'club',
-        'glove', 'helmet', 'skates', 'skis', 'snowboard', 'surfboard',
-        'ping pong ball', 'ping pong paddle', 'badminton racket', 'squash racket',
-        'lacrosse stick', 'hockey stick', 'pool cue', 'dart', 'dartboard',
-        'bowling ball', 'bowling pin', 'billiard ball', 'boxing gloves', 'punching bag',
-        'exercise bike', 'treadmill', 'elliptical', 'rowing machine', 'weight bench'
-    ]
-    
-    musical = [
-        'guitar', 'piano', 'violin', 'drums', 'trumpet', 'saxophone', 'flute',
-        'clarinet', 'trombone', 'cello', 'bass', 'keyboard', 'harmonica',
-        'acoustic guitar', 'electric guitar', 'bass guitar', 'classical guitar',
-        'banjo', 'mandolin', 'ukulele', 'harp', 'accordion', 'bagpipes',
-        'drum kit', 'snare drum', 'bass drum', 'bongos', 'conga drums',
-        'cymbals', 'xylophone', 'marimba', 'vibraphone', 'synthesizer'
-    ]
-    
-    office = [
-        'pen', 'pencil', 'marker', 'ruler', 'calculator', 'stapler', 'scissors',
-        'notebook', 'binder', 'folder', 'clipboard', 'whiteboard', 'calendar',
-        'ballpoint pen', 'gel pen', 'felt tip pen', 'fountain pen', 'mechanical pencil',
-        'colored pencil', 'permanent marker', 'dry erase marker', 'highlighter',
-        'eraser', 'paper clips', 'binder clips', 'pushpins', 'thumbtacks'
-    ]
-    
-    # NEW CATEGORIES FOR 50K EXPANSION
-    
-    clothing = [
-        'shirt', 'pants', 'dress', 'skirt', 'jacket', 'coat', 'sweater', 'hoodie',
-        'jeans', 'shorts', 'blouse', 'suit', 'tie', 'scarf', 'hat', 'cap',
-        'shoes', 'boots', 'sneakers', 'sandals', 'heels', 'flats', 'loafers',
-        'socks', 'underwear', 'bra', 'belt', 'gloves', 'mittens', 'vest'
-    ]
-    
-    jewelry = [
-        'necklace', 'bracelet', 'ring', 'earrings', 'watch', 'pendant', 'chain',
-        'brooch', 'pin', 'cufflinks', 'tie clip', 'anklet', 'charm', 'locket',
-        'engagement ring', 'wedding ring', 'class ring', 'signet ring', 'cocktail ring'
-    ]
-    
-    toys = [
-        'doll', 'action figure', 'toy car', 'toy truck', 'toy plane', 'toy train',
-        'blocks', 'lego', 'puzzle', 'board game', 'card game', 'chess set',
-        'checkers', 'dominos', 'yo yo', 'kite', 'frisbee', 'ball', 'balloon',
-        'stuffed animal', 'teddy bear', 'rocking horse', 'tricycle', 'scooter'
-    ]
-    
-    medical = [
-        'stethoscope', 'thermometer', 'blood pressure cuff', 'syringe', 'bandage',
-        'gauze', 'cast', 'crutch', 'wheelchair', 'walker', 'cane', 'splint',
-        'ice pack', 'heating pad', 'pill bottle', 'medicine bottle', 'inhaler',
-        'nebulizer', 'oxygen tank', 'defibrillator', 'x ray machine', 'mri machine'
-    ]
-    
-    garden = [
-        'flower pot', 'planter', 'watering can', 'garden hose', 'sprinkler',
-        'lawn mower', 'leaf blower', 'hedge trimmer', 'pruning shears', 'garden rake',
-        'garden shovel', 'trowel', 'wheelbarrow', 'garden cart', 'compost bin',
-        'greenhouse', 'gazebo', 'pergola', 'arbor', 'trellis', 'fence', 'gate'
-    ]
-    
-    art_supplies = [
-        'paintbrush', 'paint', 'canvas', 'easel', 'palette', 'palette knife',
-        'pencil', 'charcoal', 'pastel', 'crayon', 'marker', 'pen', 'ink',
-        'sketchbook', 'drawing pad', 'watercolor', 'acrylic paint', 'oil paint',
-        'spray paint', 'paint roller', 'paint tray', 'masking tape', 'drop cloth'
-    ]
-    
-    # NEW MASSIVE CATEGORIES FOR 100K EXPANSION
-    
-    automotive = [
-        'engine', 'transmission', 'brake', 'tire', 'wheel', 'rim', 'hubcap',
-        'bumper', 'fender', 'hood', 'trunk', 'door', 'window', 'windshield',
-        'headlight', 'taillight', 'mirror', 'steering wheel', 'dashboard',
-        'seat', 'seatbelt', 'airbag', 'radiator', 'battery', 'alternator',
-        'starter', 'carburetor', 'exhaust pipe', 'muffler', 'catalytic converter'
-    ]
-    
-    building_materials = [
-        'brick', 'concrete block', 'lumber', 'plywood', 'drywall', 'insulation',
-        'roofing shingles', 'metal roofing', 'vinyl siding', 'stucco', 'paint',
-        'primer', 'stain', 'varnish', 'polyurethane', 'caulk', 'grout', 'tile',
-        'carpet', 'hardwood flooring', 'laminate flooring', 'vinyl flooring',
-        'cement', 'mortar', 'rebar', 'steel beam', 'column', 'foundation'
-    ]
-    
-    food_items = [
-        'apple', 'banana', 'orange', 'grape', 'strawberry', 'blueberry',
-        'watermelon', 'pineapple', 'mango', 'peach', 'pear', 'cherry',
-        'carrot', 'broccoli', 'spinach', 'lettuce', 'tomato', 'potato',
-        'onion', 'garlic', 'pepper', 'cucumber', 'celery', 'corn',
-        'bread', 'cheese', 'milk', 'butter', 'yogurt', 'eggs'
-    ]
-    
-    plants = [
-        'rose', 'tulip', 'daisy', 'sunflower', 'lily', 'orchid', 'carnation',
-        'daffodil', 'iris', 'peony', 'azalea', 'rhododendron', 'hydrangea',
-        'oak tree', 'maple tree', 'pine tree', 'palm tree', 'birch tree',
-        'willow tree', 'cherry tree', 'apple tree', 'fern', 'moss', 'grass',
-        'bamboo', 'cactus', 'succulent', 'ivy', 'vine', 'shrub', 'bush'
-    ]
-    
-    containers = [
-        'box', 'bag', 'suitcase', 'backpack', 'briefcase', 'purse', 'wallet',
-        'envelope', 'package', 'crate', 'barrel', 'bucket', 'bin', 'basket',
-        'jar', 'bottle', 'can', 'container', 'cooler', 'trunk', 'chest',
-        'safe', 'vault', 'locker', 'cabinet', 'drawer', 'shelf', 'rack'
-    ]
-    
-    fabrics = [
-        'cotton', 'wool', 'silk', 'linen', 'polyester', 'nylon', 'rayon',
-        'spandex', 'denim', 'canvas', 'velvet', 'corduroy', 'fleece',
-        'flannel', 'satin', 'chiffon', 'taffeta', 'organza', 'tulle',
-        'leather', 'suede', 'fur', 'felt', 'burlap', 'mesh', 'lace'
-    ]
-    
-    hardware = [
-        'screw', 'nail', 'bolt', 'nut', 'washer', 'bracket', 'hinge',
-        'handle', 'knob', 'lock', 'key', 'chain', 'rope', 'cable',
-        'wire', 'spring', 'gear', 'pulley', 'lever', 'valve', 'pipe',
-        'fitting', 'coupling', 'adapter', 'connector', 'clamp', 'clip'
-    ]
-    
-    laboratory = [
-        'beaker', 'flask', 'test tube', 'petri dish', 'microscope',
-        'telescope', 'scale', 'balance', 'pipette', 'burette', 'funnel',
-        'thermometer', 'barometer', 'ph meter', 'centrifuge', 'incubator',
-        'autoclave', 'spectrometer', 'chromatograph', 'distillation apparatus'
-    ]
-    
-    lighting = [
-        'bulb', 'led', 'fluorescent', 'halogen', 'incandescent', 'chandelier',
-        'pendant light', 'table lamp', 'floor lamp', 'desk lamp', 'wall sconce',
-        'ceiling fan', 'track lighting', 'recessed light', 'spotlight',
-        'floodlight', 'street light', 'lantern', 'flashlight', 'candle'
-    ]
-    
-    mechanical = [
-        'motor', 'engine', 'pump', 'compressor', 'turbine', 'generator',
-        'transformer', 'alternator', 'starter', 'clutch', 'transmission',
-        'differential', 'axle', 'bearing', 'bushing', 'seal', 'gasket',
-        'filter', 'belt', 'chain', 'sprocket', 'cam', 'crankshaft'
-    ]
-    
-    # Add all expanded categories
-    all_objects.update(furniture)
-    all_objects.update(vehicles)
-    all_objects.update(tools)
-    all_objects.update(electronics)
-    all_objects.update(kitchen)
-    all_objects.update(household)
-    all_objects.update(appliances)
-    all_objects.update(sports)
-    all_objects.update(musical)
-    all_objects.update(office)
-    all_objects.update(clothing)
-    all_objects.update(jewelry)
-    all_objects.update(toys)
-    all_objects.update(medical)
-    all_objects.update(garden)
-    all_objects.update(art_supplies)
-    all_objects.update(automotive)
-    all_objects.update(building_materials)
-    all_objects.update(food_items)
-    all_objects.update(plants)
-    all_objects.update(containers)
-    all_objects.update(fabrics)
-    all_objects.update(hardware)
-    all_objects.update(laboratory)
-    all_objects.update(lighting)
-    all_objects.update(mechanical)
-    
-    # Massively expanded modifiers for 50K target
-    materials = [
-        'wooden', 'oak', 'pine', 'maple', 'cherry', 'walnut', 'mahogany', 'teak', 'cedar',
-        'birch', 'ash', 'poplar', 'bamboo', 'cork', 'plywood', 'mdf', 'particle board',
-        'metal', 'steel', 'stainless steel', 'carbon steel', 'aluminum', 'copper', 'brass', 
-        'bronze', 'iron', 'cast iron', 'wrought iron', 'titanium', 'chrome', 'nickel',
-        'zinc', 'tin', 'lead', 'silver', 'gold', 'platinum', 'galvanized', 'powder coated',
-        'plastic', 'acrylic', 'polycarbonate', 'abs', 'pvc', 'polyethylene', 'polypropylene',
-        'nylon', 'polyester', 'vinyl', 'fiberglass', 'carbon fiber', 'kevlar', 'silicone',
-        'rubber', 'natural rubber', 'synthetic rubber', 'foam rubber', 'neoprene',
-        'glass', 'tempered glass', 'laminated glass', 'safety glass', 'frosted glass',
-        'tinted glass', 'crystal', 'ceramic', 'porcelain', 'earthenware', 'stoneware',
-        'fabric', 'cotton', 'wool', 'silk', 'linen', 'canvas', 'denim', 'leather',
-        'genuine leather', 'faux leather', 'suede', 'microfiber', 'velvet', 'corduroy',
-        'stone', 'marble', 'granite', 'slate', 'limestone', 'sandstone', 'travertine',
-        'concrete', 'brick', 'clay', 'terra cotta', 'wicker', 'rattan', 'cane', 'jute'
-    ]
-    
-    colors = [
-        'red', 'crimson', 'scarlet', 'burgundy', 'maroon', 'cherry', 'rose', 'pink',
-        'hot pink', 'magenta', 'fuchsia', 'coral', 'salmon', 'peach', 'orange',
-        'tangerine', 'amber', 'yellow', 'golden', 'lemon', 'lime', 'chartreuse',
-        'green', 'forest green', 'emerald', 'sage', 'olive', 'mint', 'teal',
-        'turquoise', 'aqua', 'cyan', 'blue', 'navy', 'royal blue', 'sky blue',
-        'powder blue', 'periwinkle', 'indigo', 'violet', 'purple', 'lavender',
-        'plum', 'grape', 'black', 'charcoal', 'gray', 'grey', 'silver', 'white',
-        'ivory', 'cream', 'beige', 'tan', 'brown', 'chocolate', 'coffee', 'espresso'
-    ]
-    
-    sizes = [
-        'mini', 'micro', 'tiny', 'small', 'compact', 'petite', 'medium', 'standard',
-        'regular', 'large', 'big', 'extra large', 'xl', 'xxl', 'oversized', 'giant',
-        'jumbo', 'massive', 'huge', 'enormous', 'pocket', 'travel', 'portable',
-        'desktop', 'tabletop', 'countertop', 'floor', 'standing', 'wall', 'ceiling',
-        'commercial', 'industrial', 'professional', 'residential', 'home', 'office',
-        'studio', 'deluxe', 'premium', 'luxury', 'economy', 'basic', 'entry level'
-    ]
-    
-    styles = [
-        'modern', 'contemporary', 'traditional', 'classic', 'vintage', 'antique',
-        'retro', 'mid century', 'art deco', 'art nouveau', 'craftsman', 'mission',
-        'shaker', 'colonial', 'victorian', 'georgian', 'federal', 'empire',
-        'neoclassical', 'baroque', 'rococo', 'gothic', 'renaissance', 'rustic',
-        'farmhouse', 'country', 'cottage', 'shabby chic', 'industrial', 'urban',
-        'minimalist', 'scandinavian', 'danish', 'swedish', 'norwegian', 'finnish',
-        'mediterranean', 'tuscan', 'spanish', 'moroccan', 'asian', 'japanese',
-        'chinese', 'korean', 'indian', 'french', 'english', 'american', 'western',
-        'southwestern', 'tropical', 'coastal', 'nautical', 'bohemian', 'eclectic'
-    ]
-    
-    # Expanded modifier sets for 50K
-    modifiers = [
-        'adjustable', 'foldable', 'stackable', 'portable', 'electric', 'manual', 
-        'automatic', 'digital', 'analog', 'wireless', 'bluetooth', 'smart',
-        'programmable', 'rechargeable', 'battery powered', 'solar powered',
-        'waterproof', 'fireproof', 'rustproof', 'shatterproof', 'scratch resistant'
-    ]
-    
-    conditions = [
-        'new', 'used', 'vintage', 'antique', 'refurbished', 'restored', 'custom',
-        'handmade', 'artisan', 'designer', 'luxury', 'premium', 'imported',
-        'damaged', 'broken', 'cracked', 'chipped', 'scratched', 'dented'
-    ]
-    
-    rooms = [
-        'living room', 'bedroom', 'dining room', 'kitchen', 'bathroom', 'office',
-        'family room', 'den', 'study', 'nursery', 'guest room', 'master bedroom',
-        'basement', 'attic', 'garage', 'laundry room', 'mudroom', 'pantry',
-        'closet', 'hallway', 'entryway', 'foyer', 'sunroom', 'conservatory'
-    ]
-    
-    # Massively expanded key objects for 100K combinations
-    key_objects = [
-        'chair', 'table', 'bed', 'sofa', 'desk', 'shelf', 'cabinet', 'lamp',
-        'mirror', 'vase', 'bowl', 'plate', 'cup', 'mug', 'glass', 'bottle',
-        'pot', 'pan', 'knife', 'fork', 'spoon', 'clock', 'picture', 'frame',
-        'box', 'basket', 'bin', 'container', 'jar', 'bag', 'purse', 'wallet',
-        'pillow', 'cushion', 'blanket', 'towel', 'curtain', 'rug', 'carpet',
-        'engine', 'wheel', 'tire', 'door', 'window', 'motor', 'pump', 'filter',
-        'bulb', 'wire', 'pipe', 'valve', 'gear', 'spring', 'handle', 'knob',
-        'screw', 'bolt', 'nail', 'hinge', 'lock', 'key', 'chain', 'cable',
-        'seat', 'hood', 'roof', 'floor', 'wall', 'beam', 'column', 'panel'
-    ]
+    return None
+
+
+def iter_object_blocks():
+    """Yield the category names and each combination block of 3D object names."""
+    # Add all expanded categories as a single block, so sort receives one
+    # write and the fallback merge one sorted run instead of 26
+    yield chain(
+        _FURNITURE, _VEHICLES, _TOOLS, _ELECTRONICS,
+        _KITCHEN, _HOUSEHOLD, _APPLIANCES, _SPORTS,
+        _MUSICAL, _OFFICE, _CLOTHING, _JEWELRY,
+        _TOYS, _MEDICAL, _GARDEN, _ART_SUPPLIES,
+        _AUTOMOTIVE, _BUILDING_MATERIALS, _FOOD_ITEMS, _PLANTS,
+        _CONTAINERS, _FABRICS, _HARDWARE, _LABORATORY,
+        _LIGHTING, _MECHANICAL,
+    )
     
     # Generate massive combinations to reach 50K+
-    print("Generating material combinations...")
-    for obj in key_objects:
-        for material in materials:
-            all_objects.add(f"{material} {obj}")
-    
-    print("Generating color combinations...")
-    for obj in key_objects:
-        for color in colors:
-            all_objects.add(f"{color} {obj}")
-    
-    print("Generating size combinations...")
-    for obj in key_objects:
-        for size in sizes:
-            all_objects.add(f"{size} {obj}")
-    
-    print("Generating style combinations...")
-    for obj in key_objects:
-        for style in styles:
-            all_objects.add(f"{style} {obj}")
-    
-    print("Generating modifier combinations...")
-    for modifier in modifiers:
-        for obj in key_objects:
-            all_objects.add(f"{modifier} {obj}")
-    
-    print("Generating condition combinations...")
-    for condition in conditions:
-        for obj in key_objects:
-            all_objects.add(f"{condition} {obj}")
-    
-    print("Generating room combinations...")
-    for room in rooms:
-        for obj in key_objects:
-            all_objects.add(f"{room} {obj}")
+    print("Generating single-attribute combinations...")
+    yield product_join(_ATTRIBUTES, _KEY_OBJECTS)
     
     # Add cross-combinations for even more variety to reach 50K
     print("Generating cross-combinations...")
-    for material in materials[:25]:  # Top 25 materials
-        for color in colors[:25]:    # Top 25 colors
-            for obj in key_objects[:20]:  # Top 20 objects
-                all_objects.add(f"{material} {color} {obj}")
-    
-    for size in sizes[:20]:  # Top 20 sizes
-        for style in styles[:20]:  # Top 20 styles
-            for obj in key_objects[:15]:  # Top 15 objects
-                all_objects.add(f"{size} {style} {obj}")
+    yield product_join(_MATERIALS[:25], _COLORS[:25], _KEY_OBJECTS[:20])
+    yield product_join(_SIZES[:20], _STYLES[:20], _KEY_OBJECTS[:15])
     
     # Triple combinations for maximum expansion
     print("Generating triple combinations...")
-    for material in materials[:15]:  # Top 15 materials
-        for size in sizes[:15]:      # Top 15 sizes
-            for obj in key_objects[:10]:  # Top 10 objects
-                all_objects.add(f"{material} {size} {obj}")
-    
-    for color in colors[:15]:        # Top 15 colors
-        for condition in conditions[:10]:  # Top 10 conditions
-            for obj in key_objects[:10]:   # Top 10 objects
-                all_objects.add(f"{color} {condition} {obj}")
+    yield product_join(_MATERIALS[:15], _SIZES[:15], _KEY_OBJECTS[:10])
+    yield product_join(_COLORS[:15], _CONDITIONS[:10], _KEY_OBJECTS[:10])
     
     # Quadruple combinations for maximum variety
     print("Generating quadruple combinations...")
-    for material in materials[:10]:  # Top 10 materials
-        for color in colors[:10]:    # Top 10 colors
-            for size in sizes[:8]:   # Top 8 sizes
-                for obj in key_objects[:8]:  # Top 8 objects
-                    all_objects.add(f"{material} {color} {size} {obj}")
+    yield product_join(_MATERIALS[:10], _COLORS[:10], _SIZES[:8], _KEY_OBJECTS[:8])
     
     # Room + style + object combinations
     print("Generating room-style combinations...")
-    for room in rooms[:20]:         # Top 20 rooms
-        for style in styles[:20]:   # Top 20 styles
-            for obj in key_objects[:15]:  # Top 15 objects
-                all_objects.add(f"{room} {style} {obj}")
+    yield product_join(_ROOMS[:20], _STYLES[:20], _KEY_OBJECTS[:15])
     
     # Material + condition + object combinations
     print("Generating material-condition combinations...")
-    for material in materials[:25]:   # Top 25 materials
-        for condition in conditions:  # All conditions
-            for obj in key_objects[:20]:  # Top 20 objects
-                all_objects.add(f"{material} {condition} {obj}")
+    yield product_join(_MATERIALS[:25], _CONDITIONS, _KEY_OBJECTS[:20])
     
     # MASSIVE EXPANSION FOR 100K TARGET
     
     # Size + material + color combinations
     print("Generating size-material-color combinations...")
-    for size in sizes[:15]:          # Top 15 sizes
-        for material in materials[:15]:  # Top 15 materials
-            for color in colors[:15]:    # Top 15 colors
-                for obj in key_objects[:8]:  # Top 8 objects
-                    all_objects.add(f"{size} {material} {color} {obj}")
+    yield product_join(_SIZES[:15], _MATERIALS[:15], _COLORS[:15], _KEY_OBJECTS[:8])
     
     # Style + condition + room combinations
     print("Generating style-condition-room combinations...")
-    for style in styles[:20]:        # Top 20 styles
-        for condition in conditions[:10]:  # Top 10 conditions
-            for room in rooms[:15]:      # Top 15 rooms
-                for obj in key_objects[:10]:  # Top 10 objects
-                    all_objects.add(f"{style} {condition} {room} {obj}")
+    yield product_join(_STYLES[:20], _CONDITIONS[:10], _ROOMS[:15], _KEY_OBJECTS[:10])
     
     # Modifier + material + size combinations
     print("Generating modifier-material-size combinations...")
-    for modifier in modifiers[:15]:   # Top 15 modifiers
-        for material in materials[:15]:  # Top 15 materials
-            for size in sizes[:12]:      # Top 12 sizes
-                for obj in key_objects[:12]:  # Top 12 objects
-                    all_objects.add(f"{modifier} {material} {size} {obj}")
+    yield product_join(_MODIFIERS[:15], _MATERIALS[:15], _SIZES[:12], _KEY_OBJECTS[:12])
     
     # Color + style + modifier combinations
     print("Generating color-style-modifier combinations...")
-    for color in colors[:20]:        # Top 20 colors
-        for style in styles[:15]:    # Top 15 styles
-            for modifier in modifiers[:12]:  # Top 12 modifiers
-                for obj in key_objects[:10]:  # Top 10 objects
-                    all_objects.add(f"{color} {style} {modifier} {obj}")
+    yield product_join(_COLORS[:20], _STYLES[:15], _MODIFIERS[:12], _KEY_OBJECTS[:10])
     
     # Room + material + condition + size combinations (5-word combos!)
     print("Generating 5-word combinations...")
-    for room in rooms[:10]:          # Top 10 rooms
-        for material in materials[:10]:  # Top 10 materials
-            for condition in conditions[:8]:  # Top 8 conditions
-                for size in sizes[:8]:       # Top 8 sizes
-                    for obj in key_objects[:6]:  # Top 6 objects
-                        all_objects.add(f"{room} {material} {condition} {size} {obj}")
+    yield product_join(_ROOMS[:10], _MATERIALS[:10], _CONDITIONS[:8], _SIZES[:8], _KEY_OBJECTS[:6])
     
     # Brand-style combinations (adding brand-like modifiers)
-    brands = ['premium', 'luxury', 'designer', 'artisan', 'custom', 'handcrafted',
-              'vintage', 'antique', 'modern', 'classic', 'industrial', 'commercial']
     print("Generating brand combinations...")
-    for brand in brands:
-        for material in materials[:20]:  # Top 20 materials
-            for obj in key_objects[:25]:     # Top 25 objects
-                all_objects.add(f"{brand} {material} {obj}")
+    yield product_join(_BRANDS, _MATERIALS[:20], _KEY_OBJECTS[:25])
     
     # Technical specifications combinations
-    specs = ['heavy duty', 'lightweight', 'extra strong', 'ultra thin', 
-             'high capacity', 'low profile', 'multi purpose', 'single use',
-             'weatherproof', 'indoor', 'outdoor', 'professional grade']
     print("Generating technical spec combinations...")
-    for spec in specs:
-        for color in colors[:15]:        # Top 15 colors
-            for obj in key_objects[:20]:     # Top 20 objects
-                all_objects.add(f"{spec} {color} {obj}")
-    
+    yield product_join(_SPECS, _COLORS[:15], _KEY_OBJECTS[:20])
+
+
+def iter_objects():
+    """Yield unique 3D object names in sorted order.
+
+    Each block is sorted on its own and the sorted runs are merged. Duplicates
+    are adjacent in the merged stream, so groupby drops them without hashing.
+    """
+    merged = heapq.merge(*map(sorted, iter_object_blocks()))
+    return (obj for obj, _ in groupby(merged))
+
+
+def sort_unique_to_file(path):
+    """Write sorted unique names to path via the system `sort -u`.
+
+    Python only generates the raw combinations; deduplication and sorting run
+    in sort's C merge sort (multi-threaded on GNU coreutils). LC_ALL=C keeps
+    the byte order identical to Python's default string ordering. Returns
+    False if sort is unavailable or fails, so the caller can fall back.
+    """
+    sort_bin = shutil.which('sort')
+    if sort_bin is None:
+        return False
+    
+    env = dict(os.environ, LC_ALL='C')
+    try:
+        with subprocess.Popen([sort_bin, '-u', '-o', str(path)],
+                              stdin=subprocess.PIPE, env=env) as proc:
+            # One join, one encode and one write per block rather than one per
+            # name; the binary pipe skips the text-mode wrapper entirely
+            for block in iter_object_blocks():
+                text = '\n'.join(block)
+                if text:
+                    proc.stdin.write((text + '\n').encode('utf-8'))
+    except OSError:
+        return False
+    return proc.returncode == 0
+
+
+@functools.lru_cache(maxsize=1)
+def generate_object_list():
+    """Generate a comprehensive list of 100,000+ 3D object names.
+
+    The result is cached for the life of the process and returned as a tuple
+    so repeat callers share it safely; use list(...) if you need to mutate it.
+    """
+    objects = load_existing_objects()
+    if objects is not None:
+        return tuple(objects)
+    
+    all_objects = tuple(iter_objects())
     print(f"Generated {len(all_objects)} unique objects")
-    return sorted(list(all_objects))
+    return all_objects
 
 def main():
-    objects = generate_object_list()
-    
-    # Write to file
-    with open('objects.txt', 'w') as f:
-        for obj in objects:
-            f.write(obj + '\n')
-    
-    print(f"Generated {len(objects)} objects")
-    print(f"Saved to objects.txt")
-    
-    if len(objects) >= 100000:
+    objects = load_existing_objects()
+    if objects is not None:
+        count = len(objects)
+        print(f"Found {count} objects in {OBJECTS_FILE}, skipping generation")
+    else:
+        if not sort_unique_to_file(OBJECTS_FILE):
+            # Stream names straight into the file instead of materializing them
+            with OBJECTS_FILE.open('w', buffering=1 << 20) as f:
+                f.writelines(obj + '\n' for obj in iter_objects())
+        with OBJECTS_FILE.open('r') as f:
+            count = sum(1 for _ in f)
+        print(f"Generated {count} objects")
+        print(f"Saved to {OBJECTS_FILE}")
+    
+    if count >= 100000:
         print("✅ Successfully reached 100,000+ objects!")
-    elif len(objects) >= 50000:
-        print(f"✅ Generated {len(objects)} objects (50K+ target met)")
-    elif len(objects) >= 10000:
-        print(f"✅ Generated {len(objects)} objects (10K+ target met)")
+    elif count >= 50000:
+        print(f"✅ Generated {count} objects (50K+ target met)")
+    elif count >= 10000:
+        print(f"✅ Generated {count} objects (10K+ target met)")
     else:
-        print(f"📊 Generated {len(objects)} objects")
+        print(f"📊 Generated {count} objects")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file